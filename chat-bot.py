@@ -1,22 +1,47 @@
 import tweepy
+import tweepy.asynchronous
+import httpx
+import aiohttp
+import asyncio
 import time
 import logging
+import logging.handlers
+import queue
 import os
+import json
 from datetime import datetime
 import random
+import collections
+import contextlib
+import re
+from urllib.parse import quote, urlencode
+from oauthlib.oauth1 import Client as OAuthClient
 from dotenv import load_dotenv
 import sys
 
-# Set up logging to file and console
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("twitter_bot.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+try:
+    import uvloop  # Faster libuv-based event loop (not available on Windows)
+except ImportError:
+    uvloop = None
+
+# Set up logging to file and console. Records are queued and written by a
+# listener thread, so slow log output never blocks the event loop.
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler("twitter_bot.log"),
+    logging.StreamHandler(sys.stdout)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+
 logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logging.getLogger("httpx").setLevel(logging.WARNING)  # Don't log every API request
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,14 +54,17 @@ TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_SECRET = os.getenv("TWITTER_ACCESS_SECRET")
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 
-# Print to check if they are loaded (optional, remove this in production)
-print("API Key:", TWITTER_API_KEY)
+# Never print the secrets themselves; enable DEBUG logging to confirm they loaded
+logger.debug("Twitter API credentials loaded (key starts with %s)", TWITTER_API_KEY[:4] if TWITTER_API_KEY else "")
 
 # ======= CONFIGURATION =======
 # Bot behavior settings (customize these)
 TWEET_INTERVAL = 60 * 60  # Post every 60 minutes (in seconds)
-HASHTAGS_TO_LIKE = ["python", "coding", "technology"]  # Hashtags to search and like
+HASHTAGS_TO_LIKE = ("python", "coding", "technology")  # Hashtags to search and like
 MAX_LIKES_PER_RUN = 3  # Maximum number of tweets to like per cycle
+MAX_CONCURRENT_LIKES = 3  # Maximum number of like requests in flight at once
+CHECK_INTERVAL = 5 * 60  # Wait between bot cycles (in seconds)
+STATE_PATH = "bot_state_{user_id}.json"  # Where each account's since_id and last tweet time survive restarts
 TWEETS = [
     "Just another day coding with Python! #Python #Coding",
     "Exploring new programming techniques today. #Coding #Technology",
@@ -46,41 +74,278 @@ TWEETS = [
 ]
 # =================================================
 
+# Search queries for each hashtag, built once since they never change
+HASHTAG_QUERIES = tuple((h, f"#{h} -is:retweet lang:en") for h in HASHTAGS_TO_LIKE)
+
+ALREADY_FAVORITED_CODE = 139  # Twitter API error code for "You have already favorited this status"
+# Credential keys and the environment variables they are read from
+CREDENTIAL_VARS = {
+    "api_key": "TWITTER_API_KEY",
+    "api_secret": "TWITTER_API_SECRET",
+    "access_token": "TWITTER_ACCESS_TOKEN",
+    "access_secret": "TWITTER_ACCESS_SECRET",
+    "bearer_token": "TWITTER_BEARER_TOKEN"
+}
+
+STREAM_MAX_RETRIES = 5  # Connection attempts tweepy makes before our stream supervisor takes over
+STREAM_BACKOFF_START = 30  # First wait before the supervisor reconnects a dropped stream (in seconds)
+STREAM_BACKOFF_MAX = 15 * 60  # Longest wait between stream reconnects (in seconds)
+AUTH_BACKOFF_START = 30  # First wait before retrying a login that failed on a network or server error (in seconds)
+AUTH_BACKOFF_MAX = 60 * 60  # Longest wait between login retries (in seconds)
+HTTP_TIMEOUT = 60  # Seconds to wait on a single Twitter API request
+HTTP_ERRORS = {
+    400: tweepy.BadRequest,
+    401: tweepy.Unauthorized,
+    403: tweepy.Forbidden,
+    404: tweepy.NotFound,
+    429: tweepy.TooManyRequests
+}
+RATE_LIMIT_JITTER = 5  # Max extra seconds to wait past a rate-limit reset, so retries don't all land at once
+ROUTE_ID_PATTERN = re.compile(r"/\d{2,}")  # IDs in API routes (not the /2 version prefix), which share their endpoint's rate limit
+
 def get_credentials():
-    """Get API credentials from environment variables"""
-    required_vars = [
-        "TWITTER_API_KEY", 
-        "TWITTER_API_SECRET", 
-        "TWITTER_ACCESS_TOKEN", 
-        "TWITTER_ACCESS_SECRET",
-        "TWITTER_BEARER_TOKEN"
-    ]
+    """Get API credentials for every account from environment variables
+
+    Several accounts can be configured as a JSON list of credential dictionaries
+    in TWITTER_ACCOUNTS_JSON; otherwise a single account is read from the
+    individual TWITTER_* variables.
+    """
+    accounts_json = os.getenv("TWITTER_ACCOUNTS_JSON")
+    if accounts_json:
+        try:
+            accounts = json.loads(accounts_json)
+        except ValueError as e:
+            logger.error(f"TWITTER_ACCOUNTS_JSON is not valid JSON: {e}")
+            return []
+        if not isinstance(accounts, list):
+            logger.error("TWITTER_ACCOUNTS_JSON must be a JSON list of account objects")
+            return []
+        
+        valid = []
+        for i, account in enumerate(accounts):
+            if not isinstance(account, dict):
+                logger.error(f"Account {i} in TWITTER_ACCOUNTS_JSON is not a JSON object")
+                continue
+            missing = [key for key in CREDENTIAL_VARS if not account.get(key)]
+            if missing:
+                logger.error(f"Account {i} in TWITTER_ACCOUNTS_JSON is missing: {', '.join(missing)}")
+            else:
+                valid.append(account)
+        return valid
     
-    # Check if all required variables exist
-    missing = [var for var in required_vars if not os.getenv(var)]
+    # Read every variable once, then check that none are missing
+    credentials = {key: os.environ.get(var) for key, var in CREDENTIAL_VARS.items()}
+    missing = [CREDENTIAL_VARS[key] for key, value in credentials.items() if not value]
     if missing:
         logger.error(f"Missing environment variables: {', '.join(missing)}")
         logger.error("Create a .env file with these variables or set them in your environment")
-        return None
+        return []
     
-    # Return credentials as dictionary
-    return {
-        "api_key": os.getenv("TWITTER_API_KEY"),
-        "api_secret": os.getenv("TWITTER_API_SECRET"),
-        "access_token": os.getenv("TWITTER_ACCESS_TOKEN"),
-        "access_secret": os.getenv("TWITTER_ACCESS_SECRET"),
-        "bearer_token": os.getenv("TWITTER_BEARER_TOKEN")
-    }
-
-def authenticate_twitter():
-    """Connect to Twitter API v2"""
-    credentials = get_credentials()
-    if not credentials:
-        return None, None
+    # Return credentials as a single-account list
+    return [credentials]
+
+class TokenBucket:
+    """Rate-limit budget Twitter reports for a single API endpoint"""
+
+    def __init__(self):
+        self.remaining = None  # Unknown until the first response
+        self.reset = 0.0
+
+    def update(self, headers):
+        """Record the budget from a response's x-rate-limit-* headers"""
+        if "x-rate-limit-remaining" in headers and "x-rate-limit-reset" in headers:
+            self.remaining = int(headers["x-rate-limit-remaining"])
+            self.reset = float(headers["x-rate-limit-reset"])
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        """Wait until this endpoint has budget left, then make one request"""
+        while self.remaining == 0 and self.reset > time.time():
+            wait_time = self.reset - time.time() + random.uniform(0, RATE_LIMIT_JITTER)
+            logger.warning(f"Endpoint rate limited. Waiting {wait_time:.0f} seconds...")
+            await asyncio.sleep(wait_time)
+        if self.remaining:
+            self.remaining -= 1
+        
+        try:
+            yield
+        except tweepy.TooManyRequests as e:
+            # Park only this endpoint until Twitter says its window resets
+            self.update(e.response.headers)
+            self.remaining = 0
+            raise
+
+class CredentialsRejected(tweepy.Unauthorized):
+    """Raised when Twitter rejects an account's user credentials, so the account must re-authenticate"""
+
+class HTTPXResponse:
+    """Wraps an httpx response in the aiohttp-style interface tweepy's client and errors read"""
+
+    def __init__(self, response):
+        self.response = response
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+
+    async def json(self):
+        return self.response.json()
+
+class RateLimitedClient(tweepy.asynchronous.AsyncClient):
+    """AsyncClient sending requests over a shared HTTP/2 connection, with rate limits tracked per endpoint
+
+    tweepy still builds every request and parses every response; only the
+    transport is replaced, so all of the bot's calls multiplex over one
+    connection instead of each opening its own.
+    """
+
+    def __init__(self, http_client, **kwargs):
+        super().__init__(**kwargs)
+        self.http_client = http_client
+        self.buckets = collections.defaultdict(TokenBucket)
+
+    async def request(self, method, route, params=None, json=None, user_auth=False):
+        bucket = self.buckets[f"{method} {ROUTE_ID_PATTERN.sub('/:id', route)}"]
+        async with bucket.acquire():
+            response = await self._send(method, route, params=params, json=json, user_auth=user_auth)
+        bucket.update(response.headers)
+        return response
+
+    async def _send(self, method, route, params=None, json=None, user_auth=False):
+        url = "https://api.twitter.com" + route
+        headers = {"User-Agent": self.user_agent}
+
+        if user_auth:
+            # Sign the fully encoded URL, so the query we send is exactly the one signed
+            if params:
+                url += "?" + urlencode(sorted(params.items()), quote_via=quote)
+            oauth_client = OAuthClient(
+                self.consumer_key, self.consumer_secret,
+                self.access_token, self.access_token_secret
+            )
+            url, headers, _ = oauth_client.sign(url, method, headers=headers)
+            params = None
+        else:
+            headers["Authorization"] = f"Bearer {self.bearer_token}"
+
+        response = HTTPXResponse(await self.http_client.request(
+            method, url, params=params, json=json, headers=headers
+        ))
+
+        if not 200 <= response.status < 300:
+            try:
+                response_json = await response.json()
+            except ValueError:
+                response_json = {}
+            # Only a 401 on a user-context call means this account's credentials are bad
+            if response.status == 401 and user_auth:
+                raise CredentialsRejected(response, response_json=response_json)
+            if response.status in HTTP_ERRORS:
+                raise HTTP_ERRORS[response.status](response, response_json=response_json)
+            if response.status >= 500:
+                raise tweepy.TwitterServerError(response, response_json=response_json)
+            raise tweepy.HTTPException(response, response_json=response_json)
+
+        return response
+
+class RateLimitedAPI:
+    """Async wrapper around the synchronous v1.1 API, with rate limits tracked per endpoint
+
+    tweepy.API would sleep through a rate limit inside its worker thread, where
+    cancelling the task can't stop it; instead it raises, and the next call to
+    that endpoint waits on its bucket in the event loop.
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self.buckets = collections.defaultdict(TokenBucket)
+
+    async def call(self, method, *args, **kwargs):
+        """Run one tweepy.API method in a worker thread, once its endpoint has budget left"""
+        async with self.buckets[method].acquire():
+            return await asyncio.to_thread(getattr(self.api, method), *args, **kwargs)
+
+class CircuitBreakerError(Exception):
+    """Raised when an operation is skipped because its circuit breaker is open"""
+
+class CircuitBreaker:
+    """Stops calling one operation after repeated failures, then probes it again after a cool-down
+
+    Failures are counted per operation, so a failing endpoint is parked without
+    stopping the operations that are still healthy.
+    """
+
+    def __init__(self, name, fail_max=5, reset_timeout=300):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    async def call(self, func, *args):
+        """Run func(*args), raising CircuitBreakerError instead while the circuit is open"""
+        if self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout:
+            raise CircuitBreakerError(f"{self.name} circuit is open")
+        
+        # Once the cool-down has passed the circuit is half-open: this call is the probe
+        try:
+            result = await func(*args)
+        except CredentialsRejected:
+            raise  # The account's credentials failed, not this operation
+        except Exception:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.fail_max:
+                logger.warning(f"Pausing {self.name} for {self.reset_timeout} seconds after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            raise
+        
+        if self.opened_at is not None:
+            logger.info(f"Resuming {self.name}")
+        self.failures = 0
+        self.opened_at = None
+        return result
+
+async def run_guarded(breaker, func, *args, default=None):
+    """Call func through its circuit breaker, returning default if it fails or is paused"""
+    try:
+        return await breaker.call(func, *args)
+    except CircuitBreakerError:
+        logger.info(f"Skipping {breaker.name} while its circuit is open")
+    except CredentialsRejected:
+        raise  # Handled by re-authenticating the account
+    except Exception:
+        pass  # The operation already logged its own error
+    return default
+
+def load_state(path):
+    """Load an account's persisted state, or an empty state if there is none"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {path}, starting fresh: {e}")
+        return {}
+
+def save_state(state, path):
+    """Atomically write an account's state so a crash never leaves a partial file"""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Could not save bot state: {e}")
+
+async def authenticate_twitter(credentials, http_client):
+    """Connect one account to Twitter API v2, sharing one HTTP/2 client between clients
     
+    Network and server errors are retried with backoff; returns Nones if the credentials are rejected
+    """
     try:
         # Client for v2 endpoints that require OAuth 1.0a User Context
-        client_v1 = tweepy.Client(
+        client_v1 = RateLimitedClient(
+            http_client,
             consumer_key=credentials["api_key"],
             consumer_secret=credentials["api_secret"],
             access_token=credentials["access_token"],
@@ -88,7 +353,7 @@ def authenticate_twitter():
         )
         
         # Client for v2 endpoints with bearer token (app-only auth)
-        client_v2 = tweepy.Client(bearer_token=credentials["bearer_token"])
+        client_v2 = RateLimitedClient(http_client, bearer_token=credentials["bearer_token"])
         
         # Also create API v1.1 object for some functionalities not yet in v2
         auth = tweepy.OAuth1UserHandler(
@@ -97,23 +362,54 @@ def authenticate_twitter():
             credentials["access_token"], 
             credentials["access_secret"]
         )
-        api_v1 = tweepy.API(auth, wait_on_rate_limit=True)
+        api_v1 = RateLimitedAPI(tweepy.API(auth))
         
-        # Verify credentials
-        me = client_v1.get_me()
+        # Verify credentials; our user ID never changes, so fetch it only once
+        failures = 0
+        while True:
+            try:
+                me = await client_v1.get_me()
+                break
+            except (httpx.HTTPError, tweepy.TwitterServerError, tweepy.TooManyRequests) as e:
+                # Twitter or the network is having trouble, not our credentials, so keep trying
+                failures += 1
+                wait_time = min(AUTH_BACKOFF_START * 2 ** (failures - 1), AUTH_BACKOFF_MAX)
+                wait_time = round(random.uniform(wait_time / 2, wait_time))
+                logger.warning(f"Authentication failed: {e}. Retrying in {wait_time} seconds...")
+                await asyncio.sleep(wait_time)
         logger.info(f"Connected as @{me.data.username}")
         
-        return client_v1, client_v2, api_v1
+        return client_v1, client_v2, api_v1, me.data.id, me.data.username
     
     except tweepy.TweepyException as e:
         logger.error(f"Authentication failed: {e}")
-        return None, None, None
+        return None, None, None, None, None
+
+class TweetQueue:
+    """One account's tweets, posted round-robin from a shuffled queue so none repeats until all have been used"""
+
+    def __init__(self, tweets):
+        self.tweets = collections.deque(random.sample(tweets, len(tweets)))
+        self.taken = 0
+
+    def next(self):
+        """Take the next tweet from the queue, reshuffling after each full pass"""
+        tweet = self.tweets.popleft()
+        self.tweets.append(tweet)
+        self.taken += 1
+        
+        if self.taken % len(self.tweets) == 0:
+            random.shuffle(self.tweets)
+            # Don't let the new pass start with the tweet we just used
+            if len(self.tweets) > 1 and self.tweets[0] == tweet:
+                self.tweets.rotate(-1)
+        return tweet
 
-def post_tweet(client):
-    """Post a random tweet from our list using v2 API"""
-    tweet = random.choice(TWEETS)
+async def post_tweet(client, tweets):
+    """Post the next tweet from this account's queue using v2 API"""
+    tweet = tweets.next()
     try:
-        response = client.create_tweet(text=tweet)
+        response = await client.create_tweet(text=tweet)
         tweet_id = response.data['id']
         logger.info(f"Posted tweet: {tweet} (ID: {tweet_id})")
         return tweet_id
@@ -125,15 +421,14 @@ def post_tweet(client):
         return None
     except Exception as e:
         logger.error(f"Error posting tweet: {e}")
-        return None
+        raise
 
-def like_tweets(client_v2, api_v1):
+async def like_tweets(client_v2, api_v1):
     """Like some tweets with our target hashtags using v2 API for search and v1.1 for liking"""
-    hashtag = random.choice(HASHTAGS_TO_LIKE)
+    hashtag, query = random.choice(HASHTAG_QUERIES)
     try:
         # Search tweets with v2 API
-        query = f"#{hashtag} -is:retweet lang:en"
-        tweets = client_v2.search_recent_tweets(
+        tweets = await client_v2.search_recent_tweets(
             query=query, 
             max_results=10,
             tweet_fields=['created_at']
@@ -143,42 +438,61 @@ def like_tweets(client_v2, api_v1):
             logger.info(f"No recent tweets found with #{hashtag}")
             return 0
             
-        liked_count = 0
-        for tweet in tweets.data[:MAX_LIKES_PER_RUN]:
-            try:
-                # We need to use v1.1 API for liking as v2 might require different permissions
-                api_v1.create_favorite(tweet.id)
-                logger.info(f"Liked tweet with #{hashtag} (ID: {tweet.id})")
-                liked_count += 1
-                time.sleep(5)  # Small delay between likes
-            except tweepy.TweepyException as e:
-                if "already favorited" in str(e).lower():
-                    logger.info(f"Tweet already liked (ID: {tweet.id})")
-                else:
-                    logger.error(f"Error liking tweet {tweet.id}: {e}")
-                
-        return liked_count
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LIKES)
+        
+        async def like(tweet):
+            async with semaphore:
+                try:
+                    # We need to use v1.1 API for liking as v2 might require different permissions
+                    await api_v1.call("create_favorite", tweet.id)
+                    logger.info(f"Liked tweet with #{hashtag} (ID: {tweet.id})")
+                    return True
+                except tweepy.TweepyException as e:
+                    if ALREADY_FAVORITED_CODE in getattr(e, "api_codes", ()):
+                        logger.info(f"Tweet already liked (ID: {tweet.id})")
+                    else:
+                        logger.error(f"Error liking tweet {tweet.id}: {e}")
+                    return False
+        
+        # Like concurrently; once the endpoint is rate limited the rest wait for its reset
+        liked = await asyncio.gather(*(like(tweet) for tweet in tweets.data[:MAX_LIKES_PER_RUN]))
+        return sum(liked)
     except tweepy.TooManyRequests:
         logger.warning("Rate limit exceeded when searching tweets. Waiting before next attempt.")
         return 0
     except Exception as e:
         logger.error(f"Error searching or liking tweets: {e}")
-        return 0
+        raise
+
+async def reply_to_mention(client, mention, username):
+    """Send our automated reply to a single mention"""
+    reply = f"@{username} Thanks for the mention! This is an automated reply."
+    
+    try:
+        await client.create_tweet(
+            text=reply,
+            in_reply_to_tweet_id=mention.id
+        )
+        logger.info(f"Replied to @{username}")
+        return True
+    except CredentialsRejected:
+        raise
+    except Exception as e:
+        logger.error(f"Error replying to mention: {e}")
+        return False
 
-def reply_to_mentions(client, since_id=None):
+async def reply_to_mentions(client, user_id, since_id=None):
     """Reply to any mentions of the bot using v2 API"""
     try:
-        # Get user ID first
-        me = client.get_me()
-        user_id = me.data.id
-        
-        # Get mentions
-        query_params = {"expansions": "author_id"}
+        # Get mentions, expanding authors so usernames arrive in the same response
+        query_params = {"expansions": ["author_id"], "user_fields": ["username"]}
         if since_id:
             query_params["since_id"] = since_id
             
-        mentions = client.get_users_mentions(
+        # client holds only user credentials, so request with OAuth 1.0a User Context
+        mentions = await client.get_users_mentions(
             id=user_id,
+            user_auth=True,
             **query_params
         )
         
@@ -187,37 +501,30 @@ def reply_to_mentions(client, since_id=None):
             return since_id
             
         logger.info(f"Found {len(mentions.data)} mentions to process")
-        new_since_id = since_id
+        prev_since_id = since_id or 0
+        new_since_id = max(prev_since_id, max(m.id for m in mentions.data))
+        to_reply = [m for m in mentions.data if m.id > prev_since_id]
         
-        for mention in mentions.data:
-            if not since_id or mention.id > since_id:
-                if not new_since_id or mention.id > new_since_id:
-                    new_since_id = mention.id
-                
-                # Get username from includes
-                author_id = mention.author_id
-                username = None
-                if mentions.includes and "users" in mentions.includes:
-                    for user in mentions.includes["users"]:
-                        if user.id == author_id:
-                            username = user.username
-                            break
-                
-                if not username:
-                    user = client.get_user(id=author_id).data
-                    username = user.username
-                
-                reply = f"@{username} Thanks for the mention! This is an automated reply."
-                
-                try:
-                    client.create_tweet(
-                        text=reply,
-                        in_reply_to_tweet_id=mention.id
-                    )
-                    logger.info(f"Replied to @{username}")
-                    time.sleep(5)  # Small delay between replies
-                except Exception as e:
-                    logger.error(f"Error replying to mention: {e}")
+        # Map author IDs to usernames from the expansion data
+        usernames = {}
+        if mentions.includes and "users" in mentions.includes:
+            usernames = {user.id: user.username for user in mentions.includes["users"]}
+        
+        # Look up any authors missing from the expansion in a single request
+        missing_ids = list({m.author_id for m in to_reply if m.author_id not in usernames})
+        if missing_ids:
+            users = await client.get_users(ids=missing_ids, user_auth=True)
+            for user in users.data or []:
+                usernames[user.id] = user.username
+        
+        for mention in to_reply:
+            username = usernames.get(mention.author_id)
+            if not username:
+                logger.warning(f"Could not resolve author of mention {mention.id}, skipping")
+                continue
+            
+            if await reply_to_mention(client, mention, username):
+                await asyncio.sleep(5)  # Small delay between replies
                 
         return new_since_id
     except tweepy.TooManyRequests:
@@ -225,37 +532,38 @@ def reply_to_mentions(client, since_id=None):
         return since_id
     except Exception as e:
         logger.error(f"Error processing mentions: {e}")
-        return since_id
+        raise
 
-def follow_back_users(client, api_v1):
+async def follow_back_users(client, api_v1, user_id):
     """Follow back users who follow the bot but aren't followed back yet"""
     try:
-        me = client.get_me()
-        user_id = me.data.id
+        # Fetch bare ID lists (up to 5000 per call) instead of full user objects
+        follower_ids, friend_ids = await asyncio.gather(
+            api_v1.call("get_follower_ids", user_id=user_id, count=5000),
+            api_v1.call("get_friend_ids", user_id=user_id, count=5000)
+        )
         
-        # Get followers (using v1.1 API as it's easier to iterate)
-        followers = tweepy.Cursor(api_v1.get_followers, user_id=user_id).items(20)
-        following = tweepy.Cursor(api_v1.get_friends, user_id=user_id).items(100)
+        # Limit to 5 new follows per run to avoid rate limits
+        friend_ids = set(friend_ids)
+        new_follows = [uid for uid in follower_ids if uid not in friend_ids][:5]
+        if not new_follows:
+            logger.info("No new users to follow back")
+            return 0
         
-        # Convert following to a set of IDs for quick lookup
-        following_ids = set()
-        for user in following:
-            following_ids.add(user.id)
+        # Only the users we are about to follow need full profiles
+        followers = await api_v1.call("lookup_users", user_id=new_follows)
         
         count = 0
         for follower in followers:
-            if follower.id not in following_ids:
-                try:
-                    client.follow_user(follower.id)
-                    logger.info(f"Followed back @{follower.screen_name}")
-                    count += 1
-                    time.sleep(5)  # Small delay between follows
-                    
-                    # Limit to 5 new follows per run to avoid rate limits
-                    if count >= 5:
-                        break
-                except Exception as e:
-                    logger.error(f"Error following user @{follower.screen_name}: {e}")
+            try:
+                await client.follow_user(follower.id)
+                logger.info(f"Followed back @{follower.screen_name}")
+                count += 1
+                await asyncio.sleep(5)  # Small delay between follows
+            except CredentialsRejected:
+                raise
+            except Exception as e:
+                logger.error(f"Error following user @{follower.screen_name}: {e}")
         
         if count > 0:
             logger.info(f"Followed back {count} users")
@@ -265,73 +573,286 @@ def follow_back_users(client, api_v1):
         return count
     except Exception as e:
         logger.error(f"Error in follow-back process: {e}")
-        return 0
+        raise
 
-def run_bot():
-    """Main bot function with improved error handling and retry logic"""
-    print("🤖 Starting Twitter bot...")
-    
-    # Connect to Twitter
-    client_v1, client_v2, api_v1 = authenticate_twitter()
-    if not client_v1 or not client_v2:
-        print("⚠️  Error: Could not authenticate with Twitter API")
-        return
+class MentionStream(tweepy.asynchronous.AsyncStreamingClient):
+    """Filtered stream of mentions for every account sharing one app's bearer token
+
+    Each account's rule is tagged with its user ID, which survives a change of
+    handle, so matching tweets can be handed to that account's queue as they arrive.
+    """
+
+    def __init__(self, bearer_token):
+        # Let our supervisor handle reconnects once tweepy's own retries run out
+        super().__init__(bearer_token, max_retries=STREAM_MAX_RETRIES)
+        self.queues = {}
+        self.supervisor = None
+        self.stopping = False
+
+    async def on_response(self, response):
+        if not response.data:
+            return
+        for rule in response.matching_rules:
+            queue = self.queues.get(rule.tag)
+            if queue:
+                queue.put_nowait(response)
+
+    async def supervise(self):
+        """Keep the stream connected, reconnecting with exponential backoff whenever it drops"""
+        failures = 0
+        while not self.stopping:
+            connected_at = time.monotonic()
+            await self.filter(
+                expansions=["author_id"],
+                user_fields=["username"]
+            )
+            # tweepy swallows the cancellation from disconnect() and returns normally
+            if self.stopping:
+                break
+            
+            # A connection that stayed up for a while starts the backoff over
+            if time.monotonic() - connected_at > STREAM_BACKOFF_MAX:
+                failures = 0
+            failures += 1
+            wait_time = min(STREAM_BACKOFF_START * 2 ** (failures - 1), STREAM_BACKOFF_MAX)
+            wait_time = round(random.uniform(wait_time / 2, wait_time))
+            logger.warning(f"Mention stream disconnected. Reconnecting in {wait_time} seconds...")
+            await asyncio.sleep(wait_time)
+
+    def disconnect(self):
+        self.stopping = True
+        if self.supervisor is not None:
+            self.supervisor.cancel()
+        super().disconnect()
+
+async def subscribe_mentions(stream, user_id, username, queue):
+    """Stream mentions of username into queue; returns False if streaming is unavailable"""
+    rule = f"@{username} -is:retweet"
+    tag = str(user_id)
+    # tweepy closes the stream's session when a connection ends but keeps it set,
+    # and the rule calls below would reuse it
+    if stream.session is not None and stream.session.closed:
+        stream.session = None
+    try:
+        # Replace any older rule for this account that doesn't match the current one,
+        # including rules older versions tagged with the handle
+        rules = await stream.get_rules()
+        existing = [r for r in rules.data or [] if r.tag in (tag, username) or r.value == rule]
+        if not any(r.tag == tag and r.value == rule for r in existing):
+            if existing:
+                await stream.delete_rules([r.id for r in existing])
+            await stream.add_rules(tweepy.StreamRule(rule, tag=tag))
+    except (tweepy.TweepyException, aiohttp.ClientError) as e:
+        logger.warning(f"Mention stream unavailable for @{username}, falling back to polling: {e}")
+        return False
     
-    print("🟢 Bot is now running! Press CTRL+C to stop.")
+    stream.queues[tag] = queue
+    if stream.supervisor is None:
+        stream.supervisor = asyncio.create_task(stream.supervise())
+    logger.info(f"Streaming mentions of @{username}")
+    return True
+
+async def mention_worker(client, user_id, queue, state, state_path, breaker):
+    """Catch up on mentions missed while offline, then reply to streamed ones as they arrive"""
+    since_id = await run_guarded(
+        breaker, reply_to_mentions, client, user_id, state.get("since_id"),
+        default=state.get("since_id")
+    )
+    if since_id != state.get("since_id"):
+        state["since_id"] = since_id
+        save_state(state, state_path)
     
-    since_id = None
-    last_tweet_time = 0
+    while True:
+        response = await queue.get()
+        mention = response.data
+        
+        # Skip anything the startup catch-up already answered
+        since_id = state.get("since_id")
+        if since_id and mention.id <= since_id:
+            continue
+        
+        usernames = {user.id: user.username for user in response.includes.get("users", [])}
+        username = usernames.get(mention.author_id)
+        if not username:
+            logger.warning(f"Could not resolve author of mention {mention.id}, skipping")
+            continue
+        
+        await reply_to_mention(client, mention, username)
+        state["since_id"] = mention.id
+        save_state(state, state_path)
+
+async def tweet_worker(client, tweets, state, state_path, breaker):
+    """Post tweets on schedule, sleeping until the next one is due"""
+    # The saved wall-clock time only sets the first deadline; after that we use the
+    # monotonic clock, so system clock changes can't skip or repeat a tweet.
+    # A saved time ahead of the clock never delays the first tweet past one interval.
+    elapsed = time.time() - state.get("last_tweet_time", 0)
+    next_tweet_at = time.monotonic() + min(TWEET_INTERVAL, max(0, TWEET_INTERVAL - elapsed))
+    while True:
+        await asyncio.sleep(max(0, next_tweet_at - time.monotonic()))
+        
+        if await run_guarded(breaker, post_tweet, client, tweets):
+            state["last_tweet_time"] = time.time()
+            save_state(state, state_path)
+            next_tweet_at = time.monotonic() + TWEET_INTERVAL
+        else:
+            # Try again after the usual check interval
+            next_tweet_at = time.monotonic() + CHECK_INTERVAL
+
+async def check_worker(client_v1, client_v2, api_v1, user_id, state, state_path, breakers, streaming):
+    """Like tweets, follow back users and (without a stream) poll mentions every check interval"""
     follow_back_interval = 6 * 60 * 60  # Every 6 hours
     last_follow_back_time = 0
-    consecutive_errors = 0
-    max_errors = 5
     
-    # Main loop
+    # Each operation's failures are handled by its circuit breaker, so a cycle never fails as a whole
     while True:
-        try:
-            current_time = time.time()
-            
-            # Check and reply to mentions
-            # since_id = reply_to_mentions(client_v1, since_id)
-            
-            # Post a tweet if it's time
-            if current_time - last_tweet_time >= TWEET_INTERVAL:
-                if post_tweet(client_v1):
-                    last_tweet_time = current_time
-            
+        current_time = time.time()
+        follow_back_due = current_time - last_follow_back_time >= follow_back_interval
+        
+        # Run this cycle's operations concurrently so their API calls overlap
+        liked, new_since_id, followed = await asyncio.gather(
             # Like some tweets with our hashtags
-            # liked = like_tweets(client_v2, api_v1)
-            # if liked:
-            #     logger.info(f"Liked {liked} tweets")
-            
+            run_guarded(breakers["like"], like_tweets, client_v2, api_v1),
+            # Poll for mentions only when streaming is unavailable
+            run_guarded(breakers["mentions"], reply_to_mentions, client_v1, user_id, state.get("since_id"))
+            if not streaming else asyncio.sleep(0),
             # Follow back users periodically
-            # if current_time - last_follow_back_time >= follow_back_interval:
-            #     followed = follow_back_users(client_v1, api_v1)
-            #     if followed:
-            #         last_follow_back_time = current_time
-            
-            # Reset error counter on successful run
-            consecutive_errors = 0
-            
-            # Wait before next cycle - check every 5 minutes
-            logger.info("Waiting for next check...")
-            time.sleep(100)  # 5 minutes
+            run_guarded(breakers["follow"], follow_back_users, client_v1, api_v1, user_id)
+            if follow_back_due else asyncio.sleep(0)
+        )
+        
+        if new_since_id and new_since_id != state.get("since_id"):
+            state["since_id"] = new_since_id
+            save_state(state, state_path)
+        if liked:
+            logger.info(f"Liked {liked} tweets")
+        # A completed follow-back counts even when there was nobody new to follow
+        if follow_back_due and followed is not None:
+            last_follow_back_time = current_time
+        
+        # Wait before next cycle - check every 5 minutes
+        logger.info("Waiting for next check...")
+        await asyncio.sleep(CHECK_INTERVAL)
+
+async def run_account(credentials, http_client, streams):
+    """Run the bot for one account with improved error handling and retry logic"""
+    # Connect to Twitter
+    client_v1, client_v2, api_v1, user_id, username = await authenticate_twitter(credentials, http_client)
+    if not client_v1 or not client_v2:
+        print("⚠️  Error: Could not authenticate with Twitter API")
+        return
+    
+    print(f"🟢 Bot is now running as @{username}! Press CTRL+C to stop.")
+    
+    # State is keyed on the user ID, since the handle can change
+    state_path = STATE_PATH.format(user_id=user_id)
+    legacy_path = f"bot_state_{username}.json"  # Where older versions kept it
+    if not os.path.exists(state_path) and os.path.exists(legacy_path):
+        try:
+            os.replace(legacy_path, state_path)
+        except OSError as e:
+            logger.warning(f"Could not move {legacy_path} to {state_path}: {e}")
+    state = load_state(state_path)
+    
+    # Each account works through its own queue, so none of them posts a duplicate
+    tweets = TweetQueue(TWEETS)
+    
+    # Each operation fails independently without stopping the others
+    breakers = {name: CircuitBreaker(name) for name in ("tweet", "like", "mentions", "follow")}
+    
+    # Accounts on the same app share one stream connection
+    bearer_token = credentials["bearer_token"]
+    if bearer_token not in streams:
+        streams[bearer_token] = MentionStream(bearer_token)
+    
+    # Subscribe before the mention worker catches up, so nothing is missed in between
+    mention_queue = asyncio.Queue()
+    streaming = await subscribe_mentions(streams[bearer_token], user_id, username, mention_queue)
+    
+    # Main loop. The clients are reused across errors and rebuilt only when
+    # Twitter rejects our credentials.
+    last_reauth_time = 0
+    try:
+        while True:
+            workers = []
+            try:
+                # Tweets, mention replies and the check cycle all run independently.
+                # Without a stream, the check cycle's first poll does the catch-up.
+                workers.append(asyncio.create_task(tweet_worker(client_v1, tweets, state, state_path, breakers["tweet"])))
+                workers.append(asyncio.create_task(check_worker(
+                    client_v1, client_v2, api_v1, user_id, state, state_path, breakers, streaming
+                )))
+                if streaming:
+                    workers.append(asyncio.create_task(mention_worker(
+                        client_v1, user_id, mention_queue, state, state_path, breakers["mentions"]
+                    )))
+                
+                # Workers only return by raising, so surface the first failure
+                done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+                for worker in done:
+                    worker.result()
+            except CredentialsRejected as e:
+                logger.warning(f"Credentials for @{username} were rejected ({e}). Re-authenticating...")
+            finally:
+                for worker in workers:
+                    worker.cancel()
             
-        except KeyboardInterrupt:
-            print("\n👋 Bot stopped by user. Goodbye!")
-            break
-        except Exception as e:
-            consecutive_errors += 1
-            logger.error(f"Unhandled error: {e}")
+            # Don't re-authenticate more than once per check interval
+            wait_time = CHECK_INTERVAL - (time.monotonic() - last_reauth_time)
+            if wait_time > 0:
+                logger.warning(f"Waiting {wait_time:.0f} seconds before re-authenticating...")
+                await asyncio.sleep(wait_time)
+            last_reauth_time = time.monotonic()
             
-            if consecutive_errors >= max_errors:
-                logger.critical(f"Too many consecutive errors ({consecutive_errors}). Stopping bot.")
-                break
-                
-            # Exponential backoff on repeated errors
-            wait_time = min(300 * (2 ** (consecutive_errors - 1)), 3600)  # Max 1 hour
-            logger.warning(f"Waiting {wait_time} seconds before retry...")
-            time.sleep(wait_time)
+            # Our user ID doesn't change, so only the clients are replaced
+            client_v1, client_v2, api_v1, _, _ = await authenticate_twitter(credentials, http_client)
+            if not client_v1 or not client_v2:
+                logger.critical(f"Could not re-authenticate @{username}. Stopping.")
+                return
+    finally:
+        streams[bearer_token].queues.pop(str(user_id), None)
+
+async def main_loop():
+    """Run every configured account concurrently on one event loop"""
+    accounts = get_credentials()
+    if not accounts:
+        print("⚠️  Error: No Twitter accounts configured")
+        return
+    
+    # Every API call, across all accounts, multiplexes over a single HTTP/2 connection
+    streams = {}
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=1),
+        timeout=HTTP_TIMEOUT
+    ) as http_client:
+        try:
+            # One account crashing must not take the others down with it
+            results = await asyncio.gather(
+                *(run_account(credentials, http_client, streams) for credentials in accounts),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Account stopped after an unexpected error", exc_info=result)
+        finally:
+            for stream in streams.values():
+                stream.disconnect()
+
+def run_bot():
+    """Start the bot's event loop and run until interrupted"""
+    print("🤖 Starting Twitter bot...")
+    
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
+    try:
+        asyncio.run(main_loop())
+    except KeyboardInterrupt:
+        print("\n👋 Bot stopped by user. Goodbye!")
+    finally:
+        # Flush any queued log records before exiting
+        log_listener.stop()
 
 if __name__ == "__main__":
 